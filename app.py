@@ -79,5 +79,5 @@ if __name__ == '__main__':
     # Railway will set PORT environment variable, default to 8080
     port = int(os.environ.get('PORT', 8080))
     print(f"Starting Proposer.btc on port {port}")
-    print(f"Database file: {db.db_file}")
+    print(f"Database directory: {db.data_dir}")
     app.run(host='0.0.0.0', port=port)
@@ -1,56 +1,276 @@
+import hashlib
 import json
 import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+
+class SearchCache:
+    """Bounded LRU/TTL cache mapping (database version, normalized query) to matching proposals."""
+    
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Tuple[int, str], Tuple[float, Tuple[Dict[str, Any], ...]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Normalize a query so equivalent searches share a cache entry."""
+        return query.lower()
+    
+    def get(self, version: int, query: str) -> Tuple[Dict[str, Any], ...] | None:
+        """Return cached results, or None on a miss or expired entry."""
+        key = (version, query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def put(self, version: int, query: str, results: Tuple[Dict[str, Any], ...]) -> None:
+        """Store results, evicting the least recently used entry when full."""
+        key = (version, query)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self) -> None:
+        """Drop all cached entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
 
 class ProposalDatabase:
-    """Persistent JSON database for storing proposals with automatic saving/loading."""
+    """Persistent JSON database for storing proposals with automatic saving/loading.
+    
+    Proposals are partitioned by submission month (the same keys as
+    ``monthly_submissions`` in get_statistics). Each partition is stored as
+    its own segment file next to a manifest, so a write only rewrites the
+    segments it touched.
+    """
     
-    def __init__(self, db_file: str = "proposals.json"):
+    MANIFEST_NAME = "manifest.json"
+    UNDATED_PARTITION = "undated"
+    
+    def __init__(self, db_file: str = "proposals.json", data_dir: str = None):
+        # db_file is the legacy single-file database; it is migrated into
+        # data_dir the first time no manifest is found
         self.db_file = db_file
+        self.data_dir = data_dir or os.path.splitext(db_file)[0]
+        self.manifest_file = os.path.join(self.data_dir, self.MANIFEST_NAME)
         self.proposals: List[Dict[str, Any]] = []
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        self._dirty_partitions: set = set()
+        # Partitions whose segment could not be read; they keep their
+        # manifest entry and are never rewritten, so the data on disk survives
+        self.unreadable_partitions: set = set()
+        # Set when the manifest or legacy file could not be read; saving is
+        # refused rather than replacing data we never loaded
+        self.read_only = False
+        # Guards the proposal list, manifest and segment files; reentrant
+        # because the mutators call save_proposals while holding it
+        self._lock = threading.RLock()
+        # Change counter: bumped on every load/save so cached searches
+        # from an older version of the data are never served
+        self.version = 0
+        self.search_cache = SearchCache()
         self.load_proposals()
     
-    def load_proposals(self) -> None:
-        """Load existing proposals from JSON file."""
+    @classmethod
+    def partition_key(cls, proposal: Dict[str, Any]) -> str:
+        """Get the month partition (YYYY-MM) a proposal is stored in."""
+        try:
+            date = datetime.fromisoformat(proposal['timestamp'])
+            return f"{date.year}-{date.month:02d}"
+        except (ValueError, KeyError, TypeError):
+            return cls.UNDATED_PARTITION
+    
+    def _segment_path(self, partition: str, data_dir: str = None) -> str:
+        return os.path.join(data_dir or self.data_dir, f"{partition}.json")
+    
+    @staticmethod
+    def _write_json(path: str, data: Any) -> None:
+        """Write JSON atomically so a crash never leaves a truncated segment."""
+        # A unique temp file per writer, in the same directory so os.replace stays atomic
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(path) or '.',
+                                         prefix=f".{os.path.basename(path)}.", suffix='.tmp',
+                                         delete=False) as f:
+            tmp_path = f.name
+            try:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+                # Make the data durable before the rename can be
+                f.flush()
+                os.fsync(f.fileno())
+            except BaseException:
+                f.close()
+                os.remove(tmp_path)
+                raise
         try:
-            if os.path.exists(self.db_file):
-                with open(self.db_file, 'r', encoding='utf-8') as f:
-                    self.proposals = json.load(f)
-                print(f"Loaded {len(self.proposals)} existing proposals from {self.db_file}")
-            else:
-                print(f"No existing database found. Starting with empty database.")
+            os.replace(tmp_path, path)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+    
+    @staticmethod
+    def _file_digest(path: str) -> str:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    
+    @staticmethod
+    def _read_manifest(manifest_file: str) -> Dict[str, Dict[str, Any]]:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f).get('partitions', {})
+    
+    def load_proposals(self) -> None:
+        """Load existing proposals from the partition segments (or the legacy JSON file)."""
+        with self._lock:
+            self.unreadable_partitions = set()
+            self.read_only = False
+            try:
+                if os.path.exists(self.manifest_file):
+                    self.manifest = self._read_manifest(self.manifest_file)
+                    self.proposals = []
+                    for partition in sorted(self.manifest):
+                        path = self._segment_path(partition)
+                        try:
+                            with open(path, 'r', encoding='utf-8') as f:
+                                self.proposals.extend(json.load(f))
+                        except (json.JSONDecodeError, IOError) as e:
+                            print(f"Error loading database: partition {partition} is unreadable ({e}). "
+                                  f"Its {self.manifest[partition].get('count', '?')} proposals are "
+                                  f"unavailable and {path} will not be overwritten.")
+                            self.unreadable_partitions.add(partition)
+                    # Segments are per month; restore submission order across them
+                    self.proposals.sort(key=lambda p: p.get('id', 0))
+                    print(f"Loaded {len(self.proposals)} existing proposals from "
+                          f"{len(self.manifest) - len(self.unreadable_partitions)} partitions in {self.data_dir}")
+                elif os.path.exists(self.db_file):
+                    with open(self.db_file, 'r', encoding='utf-8') as f:
+                        self.proposals = json.load(f)
+                    print(f"Migrating {len(self.proposals)} proposals from {self.db_file} to {self.data_dir}")
+                    self.manifest = {}
+                    self._dirty_partitions = {self.partition_key(p) for p in self.proposals}
+                    self.save_proposals()
+                else:
+                    print(f"No existing database found. Starting with empty database.")
+                    self.proposals = []
+                    self.manifest = {}
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Error loading database: {e}. Starting read-only with an empty database.")
                 self.proposals = []
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error loading database: {e}. Starting with empty database.")
-            self.proposals = []
+                self.read_only = True
+            self._bump_version()
+    
+    def _bump_version(self) -> None:
+        """Mark the data as changed and drop search results for older versions."""
+        self.version += 1
+        self.search_cache.invalidate()
+    
+    def _mark_dirty(self, proposal: Dict[str, Any]) -> None:
+        self._dirty_partitions.add(self.partition_key(proposal))
     
     def save_proposals(self) -> None:
-        """Save current proposals to JSON file."""
-        try:
-            with open(self.db_file, 'w', encoding='utf-8') as f:
-                json.dump(self.proposals, f, indent=2, ensure_ascii=False)
-            print(f"Saved {len(self.proposals)} proposals to {self.db_file}")
-        except IOError as e:
-            print(f"Error saving database: {e}")
+        """Save changed partitions to their segment files and update the manifest.
+        
+        Only partitions marked dirty by a write are rewritten; calling this
+        with nothing marked rewrites every partition.
+        """
+        with self._lock:
+            self._bump_version()
+            if self.read_only:
+                print(f"Error saving database: {self.data_dir} was not loaded cleanly; refusing to overwrite it")
+                return
+            dirty = self._dirty_partitions or (
+                set(self.manifest) | {self.partition_key(p) for p in self.proposals})
+            skipped = dirty & self.unreadable_partitions
+            if skipped:
+                print(f"Error saving database: not rewriting unreadable partitions {', '.join(sorted(skipped))}")
+                dirty = dirty - skipped
+            try:
+                os.makedirs(self.data_dir, exist_ok=True)
+                segments: Dict[str, List[Dict[str, Any]]] = {partition: [] for partition in dirty}
+                for proposal in self.proposals:
+                    partition = self.partition_key(proposal)
+                    if partition in segments:
+                        segments[partition].append(proposal)
+                
+                # Keep going past a failed segment so the manifest still
+                # describes every segment that was replaced on disk
+                failed = set()
+                for partition, proposals in segments.items():
+                    path = self._segment_path(partition)
+                    try:
+                        if proposals:
+                            self._write_json(path, proposals)
+                            self.manifest[partition] = {
+                                'file': os.path.basename(path),
+                                'count': len(proposals),
+                                'sha256': self._file_digest(path),
+                                'updated': datetime.now().isoformat()
+                            }
+                        else:
+                            self.manifest.pop(partition, None)
+                            if os.path.exists(path):
+                                os.remove(path)
+                    except IOError as e:
+                        print(f"Error saving database: {e}")
+                        failed.add(partition)
+                
+                self._write_json(self.manifest_file, {'partitions': dict(sorted(self.manifest.items()))})
+                # Failed partitions stay dirty so the next save retries them
+                self._dirty_partitions = failed
+                print(f"Saved {len(self.proposals)} proposals to {self.data_dir} "
+                      f"(rewrote {len(segments) - len(failed)} of {len(self.manifest)} partitions)")
+            except IOError as e:
+                print(f"Error saving database: {e}")
     
     def add_proposal(self, proposal_data: Dict[str, Any]) -> Dict[str, Any]:
         """Add a new proposal and save to database."""
-        # Add timestamp if not present
-        if 'timestamp' not in proposal_data:
-            proposal_data['timestamp'] = datetime.now().isoformat()
-        
-        # Add unique ID
-        proposal_data['id'] = len(self.proposals) + 1
-        
-        # Add to memory
-        self.proposals.append(proposal_data)
-        
-        # Save to file immediately
-        self.save_proposals()
-        
-        print(f"Added proposal {proposal_data['id']}: {proposal_data['title']}")
-        return proposal_data
+        with self._lock:
+            # Add timestamp if not present
+            if 'timestamp' not in proposal_data:
+                proposal_data['timestamp'] = datetime.now().isoformat()
+            
+            # Add unique ID (counting unreadable partitions so their ids are not reused)
+            unreadable = sum(self.manifest[p].get('count', 0) for p in self.unreadable_partitions)
+            highest = max((p.get('id', 0) for p in self.proposals), default=0)
+            proposal_data['id'] = max(len(self.proposals) + unreadable, highest) + 1
+            
+            # Add to memory
+            self.proposals.append(proposal_data)
+            self._mark_dirty(proposal_data)
+            
+            # Save to file immediately
+            self.save_proposals()
+            
+            print(f"Added proposal {proposal_data['id']}: {proposal_data['title']}")
+            return proposal_data
     
     def get_all_proposals(self) -> List[Dict[str, Any]]:
         """Get all proposals."""
@@ -65,41 +285,52 @@ class ProposalDatabase:
     
     def update_proposal(self, proposal_id: int, updates: Dict[str, Any]) -> Dict[str, Any] | None:
         """Update an existing proposal."""
-        for i, proposal in enumerate(self.proposals):
-            if proposal.get('id') == proposal_id:
-                # Update fields
-                proposal.update(updates)
-                proposal['last_updated'] = datetime.now().isoformat()
-                
-                # Save to file
-                self.save_proposals()
-                
-                print(f"Updated proposal {proposal_id}")
-                return proposal
-        return None
+        with self._lock:
+            for i, proposal in enumerate(self.proposals):
+                if proposal.get('id') == proposal_id:
+                    # Update fields (the timestamp may move it to another partition)
+                    self._mark_dirty(proposal)
+                    proposal.update(updates)
+                    self._mark_dirty(proposal)
+                    proposal['last_updated'] = datetime.now().isoformat()
+                    
+                    # Save to file
+                    self.save_proposals()
+                    
+                    print(f"Updated proposal {proposal_id}")
+                    return proposal
+            return None
     
     def delete_proposal(self, proposal_id: int) -> bool:
         """Delete a proposal by ID."""
-        for i, proposal in enumerate(self.proposals):
-            if proposal.get('id') == proposal_id:
-                deleted_proposal = self.proposals.pop(i)
-                self.save_proposals()
-                print(f"Deleted proposal {proposal_id}: {deleted_proposal['title']}")
-                return True
-        return False
+        with self._lock:
+            for i, proposal in enumerate(self.proposals):
+                if proposal.get('id') == proposal_id:
+                    deleted_proposal = self.proposals.pop(i)
+                    self._mark_dirty(deleted_proposal)
+                    self.save_proposals()
+                    print(f"Deleted proposal {proposal_id}: {deleted_proposal['title']}")
+                    return True
+            return False
     
     def search_proposals(self, query: str) -> List[Dict[str, Any]]:
         """Search proposals by title, description, or problem."""
-        query = query.lower()
-        results = []
-        
-        for proposal in self.proposals:
-            if (query in proposal.get('title', '').lower() or
-                query in proposal.get('description', '').lower() or
-                query in proposal.get('problem', '').lower()):
-                results.append(proposal)
+        query = SearchCache.normalize(query)
+        # Results are cached as the matching proposal dicts themselves, so they
+        # stay valid whatever happens to the list and no write lock is needed
+        version = self.version
+        results = self.search_cache.get(version, query)
+        if results is None:
+            results = tuple(
+                proposal for proposal in self.proposals
+                if (query in (proposal.get('title') or '').lower() or
+                    query in (proposal.get('description') or '').lower() or
+                    query in (proposal.get('problem') or '').lower()))
+            # Skip caching if a write landed while we were scanning
+            if self.version == version:
+                self.search_cache.put(version, query, results)
         
-        return results
+        return list(results)
     
     def get_proposals_by_status(self, status: str) -> List[Dict[str, Any]]:
         """Get proposals by status (if you add status field later)."""
@@ -124,30 +355,83 @@ class ProposalDatabase:
             'total_proposals': total_proposals,
             'total_investment_btc': total_investment,
             'monthly_submissions': monthly_counts,
-            'database_file': self.db_file,
+            'database_file': self.manifest_file,
+            'partitions': {partition: info['count'] for partition, info in sorted(self.manifest.items())},
+            'unreadable_partitions': sorted(self.unreadable_partitions),
+            'database_version': self.version,
+            'search_cache': self.search_cache.get_statistics(),
             'last_updated': datetime.now().isoformat()
         }
     
     def backup_database(self, backup_file: str = None) -> str:
         """Create a backup of the current database."""
-        if backup_file is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = f"proposals_backup_{timestamp}.json"
+        with self._lock:
+            if backup_file is None:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                backup_file = f"proposals_backup_{timestamp}.json"
+            
+            try:
+                with open(backup_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.proposals, f, indent=2, ensure_ascii=False)
+                print(f"Database backed up to {backup_file}")
+                return backup_file
+            except IOError as e:
+                print(f"Error creating backup: {e}")
+                return ""
+    
+    def backup_partitions(self, backup_dir: str) -> List[str]:
+        """Incrementally back up segment files into backup_dir.
         
-        try:
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                json.dump(self.proposals, f, indent=2, ensure_ascii=False)
-            print(f"Database backed up to {backup_file}")
-            return backup_file
-        except IOError as e:
-            print(f"Error creating backup: {e}")
-            return ""
+        Partitions whose segment file on disk hashes to the checksum recorded
+        in the manifest already in backup_dir are skipped. Returns the
+        partitions that were copied.
+        """
+        with self._lock:
+            backup_manifest_file = os.path.join(backup_dir, self.MANIFEST_NAME)
+            try:
+                os.makedirs(backup_dir, exist_ok=True)
+                backed_up = {}
+                if os.path.exists(backup_manifest_file):
+                    backed_up = self._read_manifest(backup_manifest_file)
+                
+                # Hash the actual segment files rather than trusting the
+                # in-memory manifest, which a failed save can leave stale
+                copied = []
+                partitions = {}
+                for partition, info in sorted(self.manifest.items()):
+                    path = self._segment_path(partition)
+                    if not os.path.exists(path):
+                        print(f"Error creating partition backup: {path} is missing, skipping it")
+                        if partition in backed_up:
+                            partitions[partition] = backed_up[partition]
+                        continue
+                    partitions[partition] = dict(info, sha256=self._file_digest(path))
+                    if backed_up.get(partition, {}).get('sha256') == partitions[partition]['sha256']:
+                        continue
+                    shutil.copy2(path, self._segment_path(partition, backup_dir))
+                    copied.append(partition)
+                
+                # Remove segments for partitions that no longer exist
+                for partition in set(backed_up) - set(self.manifest):
+                    path = self._segment_path(partition, backup_dir)
+                    if os.path.exists(path):
+                        os.remove(path)
+                
+                self._write_json(backup_manifest_file, {'partitions': partitions})
+                print(f"Backed up {len(copied)} changed partitions to {backup_dir} "
+                      f"({len(partitions) - len(copied)} unchanged)")
+                return copied
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Error creating partition backup: {e}")
+                return []
     
     def clear_database(self) -> None:
         """Clear all proposals (use with caution!)."""
-        self.proposals = []
-        self.save_proposals()
-        print("Database cleared")
+        with self._lock:
+            self._dirty_partitions.update(self.manifest)
+            self.proposals = []
+            self.save_proposals()
+            print("Database cleared")
 
-# Global database instance
-db = ProposalDatabase()
+# Global database instance (DATABASE_FILE lets tests and load runs point at a scratch database)
+db = ProposalDatabase(os.environ.get('DATABASE_FILE', 'proposals.json'))
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Concurrent load generator for the proposer.btc HTTP surface
+Starts a local gunicorn instance on a synthetic seeded database (or targets an
+existing server with --url) and reports throughput, latency percentiles and
+error rates per endpoint.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+
+# Importing database builds the global instance from DATABASE_FILE; point it at a
+# path that does not exist so the real proposals.json is never loaded or migrated
+os.environ['DATABASE_FILE'] = os.path.join(tempfile.gettempdir(), 'proposer-loadtest-unused', 'proposals.json')
+
+from database import ProposalDatabase
+
+HOT_QUERIES = ['bitcoin', 'lightning', 'ordinals', 'mining', 'wallet', 'taproot']
+WORDS = HOT_QUERIES + ['protocol', 'custody', 'payments', 'privacy', 'fees', 'nodes',
+                       'merchant', 'bridge', 'layer', 'oracle', 'vault', 'channel']
+DEFAULT_MIX = 'search=5,proposals=3,health=1,submit=1'
+# Used with --url: submits would leave synthetic proposals in a real database
+READ_ONLY_MIX = 'search=5,proposals=3,health=1'
+# database.py reports failed loads/saves only by printing, while the request still returns 200
+SERVER_ERROR_MARKERS = ('Error loading database', 'Error saving database', 'Traceback')
+
+
+def synthetic_proposal(rng, timestamp):
+    """Build a random proposal shaped like a form submission."""
+    title = ' '.join(rng.choice(WORDS) for _ in range(3)).title()
+    return {
+        'title': title,
+        'subtitle': ' '.join(rng.choice(WORDS) for _ in range(5)),
+        'description': ' '.join(rng.choice(WORDS) for _ in range(40)),
+        'problem': ' '.join(rng.choice(WORDS) for _ in range(20)),
+        'github': f"https://github.com/loadtest/{title.lower().replace(' ', '-')}",
+        'youtube': 'https://youtube.com/watch?v=loadtest',
+        'email': 'loadtest@example.com',
+        'website': 'https://example.com',
+        'eta': f"{rng.randint(1, 12)} months",
+        'investment': f"{rng.uniform(0.0001, 2):.4f}",
+        'timestamp': timestamp.isoformat()
+    }
+
+
+def seed_database(db_file, count, seed):
+    """Write `count` synthetic proposals spread over the last two years."""
+    rng = random.Random(seed)
+    database = ProposalDatabase(db_file)
+    now = datetime.now()
+    timestamps = sorted(now - timedelta(days=rng.uniform(0, 730)) for _ in range(count))
+    database.proposals = []
+    for i, timestamp in enumerate(timestamps, start=1):
+        proposal = synthetic_proposal(rng, timestamp)
+        proposal['id'] = i
+        database.proposals.append(proposal)
+    database.save_proposals()
+    return database
+
+
+def parse_mix(mix):
+    """Parse 'search=5,health=1' into endpoint weights."""
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def request_submit(session, base_url, rng, timeout):
+    data = synthetic_proposal(rng, datetime.now())
+    data.pop('timestamp')
+    return session.post(f"{base_url}/submit", data=data, timeout=timeout)
+
+
+def request_proposals(session, base_url, rng, timeout):
+    return session.get(f"{base_url}/api/proposals", timeout=timeout)
+
+
+def request_search(session, base_url, rng, timeout):
+    # Traffic is dominated by a few hot queries with a long tail
+    query = rng.choice(HOT_QUERIES) if rng.random() < 0.8 else rng.choice(WORDS)
+    return session.get(f"{base_url}/api/search", params={'q': query}, timeout=timeout)
+
+
+def request_health(session, base_url, rng, timeout):
+    return session.get(f"{base_url}/health", timeout=timeout)
+
+
+ENDPOINTS = {
+    'submit': request_submit,
+    'proposals': request_proposals,
+    'search': request_search,
+    'health': request_health
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct * len(sorted_values) / 100) - 1))
+    return sorted_values[rank]
+
+
+class LoadTester:
+    def __init__(self, base_url, mix, concurrency=8, duration=30.0, seed=0, timeout=10.0):
+        self.base_url = base_url.rstrip('/')
+        self.mix = mix
+        self.concurrency = concurrency
+        self.duration = duration
+        self.seed = seed
+        self.timeout = timeout
+        self.results = {name: [] for name in mix}
+        self.errors = {name: 0 for name in mix}
+        self._lock = threading.Lock()
+
+    def worker(self, worker_id, deadline):
+        """Issue requests from one thread until the deadline."""
+        rng = random.Random(self.seed * 1000 + worker_id)
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        session = requests.Session()
+        latencies = {name: [] for name in names}
+        errors = {name: 0 for name in names}
+
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = ENDPOINTS[name](session, self.base_url, rng, self.timeout)
+                ok = response.status_code < 400
+            except requests.exceptions.RequestException:
+                ok = False
+            latencies[name].append(time.perf_counter() - start)
+            if not ok:
+                errors[name] += 1
+
+        with self._lock:
+            for name in names:
+                self.results[name].extend(latencies[name])
+                self.errors[name] += errors[name]
+
+    def run(self):
+        """Run all workers and return the report."""
+        deadline = time.monotonic() + self.duration
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for future in [executor.submit(self.worker, i, deadline) for i in range(self.concurrency)]:
+                future.result()
+        return self.report(time.perf_counter() - start)
+
+    def report(self, elapsed):
+        """Summarize throughput, latency percentiles (ms) and error rates."""
+        def summarize(latencies, errors):
+            latencies = sorted(latencies)
+            return {
+                'requests': len(latencies),
+                'errors': errors,
+                'error_rate': errors / len(latencies) if latencies else 0.0,
+                'throughput_rps': len(latencies) / elapsed if elapsed else 0.0,
+                'p50_ms': percentile(latencies, 50) * 1000,
+                'p95_ms': percentile(latencies, 95) * 1000,
+                'p99_ms': percentile(latencies, 99) * 1000
+            }
+
+        all_latencies = [latency for latencies in self.results.values() for latency in latencies]
+        return {
+            'base_url': self.base_url,
+            'concurrency': self.concurrency,
+            'duration_s': elapsed,
+            'mix': self.mix,
+            'total': summarize(all_latencies, sum(self.errors.values())),
+            'endpoints': {name: summarize(self.results[name], self.errors[name]) for name in self.mix}
+        }
+
+
+def print_report(report):
+    """Print the report as a table."""
+    print("\n" + "=" * 78)
+    print(f"📊 {report['base_url']} - {report['concurrency']} workers, {report['duration_s']:.1f}s")
+    print("=" * 78)
+    print(f"{'endpoint':<12}{'requests':>10}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>16}")
+    rows = list(report['endpoints'].items()) + [('TOTAL', report['total'])]
+    for name, stats in rows:
+        print(f"{name:<12}{stats['requests']:>10}{stats['throughput_rps']:>10.1f}"
+              f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}"
+              f"{stats['errors']:>8} ({stats['error_rate']:.1%})")
+    if 'server_errors' in report:
+        errors = report['server_errors']
+        if errors['count']:
+            print(f"\n❌ {errors['count']} database errors in the server log (responses were still 200):")
+            for line in errors['samples']:
+                print(f"   {line}")
+        else:
+            print("\n✅ No database errors in the server log")
+
+
+def wait_for_server(base_url, server=None, timeout=30.0):
+    """Poll /health until the server answers or the timeout expires.
+    
+    When `server` is our gunicorn process, give up as soon as it exits (e.g. the
+    port is taken) rather than load testing whatever else answers on that port.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            print(f"❌ gunicorn exited with status {server.returncode} (is the port already in use?)")
+            return False
+        try:
+            if requests.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return True
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def port_available(port):
+    """Check nothing is listening on the local port before starting gunicorn."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(('127.0.0.1', port))
+            return True
+        except OSError:
+            return False
+
+
+def start_gunicorn(db_file, port, workers, threads, log_file):
+    """Start gunicorn serving app:app against the seeded database, logging to log_file."""
+    env = dict(os.environ, DATABASE_FILE=db_file, PYTHONUNBUFFERED='1')
+    command = [sys.executable, '-m', 'gunicorn', 'app:app',
+               '--bind', f"127.0.0.1:{port}",
+               '--workers', str(workers),
+               '--threads', str(threads),
+               '--log-level', 'warning']
+    return subprocess.Popen(command, cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                            stdout=log_file, stderr=subprocess.STDOUT)
+
+
+def server_errors(log_path):
+    """Collect database errors and tracebacks the server only logged."""
+    with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+        return [line.strip() for line in f if line.startswith(SERVER_ERROR_MARKERS)]
+
+
+def main():
+    """Main load test runner"""
+    parser = argparse.ArgumentParser(description="Load test the proposer.btc HTTP surface")
+    parser.add_argument('--url', help="Target an already running server instead of starting gunicorn")
+    parser.add_argument('--mix',
+                        help=f"Endpoint weights ({', '.join(ENDPOINTS)}; default: '{DEFAULT_MIX}', "
+                             f"or '{READ_ONLY_MIX}' with --url)")
+    parser.add_argument('--allow-writes', action='store_true',
+                        help="Allow submit in the mix with --url (adds synthetic proposals to that server)")
+    parser.add_argument('--concurrency', type=int, default=8, help="Client threads (default: 8)")
+    parser.add_argument('--duration', type=float, default=30.0, help="Seconds to run (default: 30)")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for data and request mix")
+    parser.add_argument('--proposals', type=int, default=500, help="Synthetic proposals to seed (default: 500)")
+    parser.add_argument('--port', type=int, default=9998, help="Port for the local gunicorn (default: 9998)")
+    # Each worker process holds its own in-memory database and rewrites the same
+    # segment files, so more than one worker loses submissions
+    parser.add_argument('--workers', type=int, default=1,
+                        help="gunicorn worker processes (default: 1; each worker has its own in-memory database)")
+    parser.add_argument('--threads', type=int, default=4, help="gunicorn threads per worker (default: 4)")
+    parser.add_argument('--json', dest='json_file', help="Also write the report as JSON to this file")
+    args = parser.parse_args()
+
+    if args.mix is None:
+        args.mix = READ_ONLY_MIX if args.url else DEFAULT_MIX
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.url and 'submit' in mix and not args.allow_writes:
+        parser.error("submit in --mix would POST synthetic proposals to --url; pass --allow-writes to confirm")
+
+    print("🚀 Proposer.btc Load Test")
+    if args.url and 'submit' in mix:
+        print(f"⚠️  Writing synthetic proposals to {args.url}; they cannot be removed in bulk")
+    if not args.url and args.workers > 1 and 'submit' in mix:
+        print(f"⚠️  {args.workers} workers each keep their own in-memory database; "
+              "concurrent submits will overwrite each other's segments")
+    server = None
+    log_path = None
+    with tempfile.TemporaryDirectory(prefix='proposer-loadtest-') as data_dir:
+        if args.url:
+            base_url = args.url
+        else:
+            # gunicorn retries a busy port for several seconds, during which
+            # another server could answer /health in its place
+            if not port_available(args.port):
+                print(f"❌ Port {args.port} is already in use; pick another with --port")
+                sys.exit(1)
+            db_file = os.path.join(data_dir, 'proposals.json')
+            seed_database(db_file, args.proposals, args.seed)
+            base_url = f"http://127.0.0.1:{args.port}"
+            print(f"Starting gunicorn on {base_url} ({args.workers} workers x {args.threads} threads)")
+            log_path = os.path.join(data_dir, 'gunicorn.log')
+            log_file = open(log_path, 'w', encoding='utf-8')
+            server = start_gunicorn(db_file, args.port, args.workers, args.threads, log_file)
+
+        try:
+            if not wait_for_server(base_url, server):
+                print(f"❌ Cannot reach {base_url}/health")
+                sys.exit(1)
+            print(f"Running mix {args.mix} with {args.concurrency} workers for {args.duration:.0f}s")
+            tester = LoadTester(base_url, mix, args.concurrency, args.duration, args.seed)
+            report = tester.run()
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+                log_file.close()
+
+        if log_path is not None:
+            errors = server_errors(log_path)
+            report['server_errors'] = {'count': len(errors), 'samples': errors[:5]}
+
+    print_report(report)
+    if args.json_file:
+        with open(args.json_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,7 @@ Commands:
   list                    - List all proposals
   stats                   - Show database statistics
   backup [filename]       - Create database backup
+  backup-partitions <dir> - Back up changed partition segments only
   search <query>          - Search proposals
   view <id>              - View specific proposal
   clear                  - Clear all proposals (DANGEROUS!)
@@ -28,6 +29,7 @@ Examples:
   python3 manage_db.py list
   python3 manage_db.py stats
   python3 manage_db.py backup my_backup.json
+  python3 manage_db.py backup-partitions backups/
   python3 manage_db.py search "bitcoin"
   python3 manage_db.py view 1
 """)
@@ -56,6 +58,11 @@ def show_stats():
     print(f"Database File: {stats['database_file']}")
     print(f"Last Updated: {stats['last_updated']}")
     
+    if stats['partitions']:
+        print("\nStorage Partitions:")
+        for partition, count in stats['partitions'].items():
+            print(f"  {partition}: {count} proposals")
+    
     if stats['monthly_submissions']:
         print("\nMonthly Submissions:")
         for month, count in sorted(stats['monthly_submissions'].items()):
@@ -69,6 +76,14 @@ def create_backup(filename=None):
     else:
         print("Failed to create backup.")
 
+def backup_partitions(backup_dir):
+    """Create an incremental backup of the partition segments."""
+    copied = db.backup_partitions(backup_dir)
+    if copied:
+        print(f"Copied partitions: {', '.join(copied)}")
+    else:
+        print("No changed partitions to copy.")
+
 def search_proposals(query):
     """Search proposals by query."""
     results = db.search_proposals(query)
@@ -138,6 +153,12 @@ def main():
     elif command == 'backup':
         filename = sys.argv[2] if len(sys.argv) > 2 else None
         create_backup(filename)
+    elif command == 'backup-partitions':
+        if len(sys.argv) < 3:
+            print("Error: Backup directory required.")
+            print("Usage: python3 manage_db.py backup-partitions <dir>")
+            return
+        backup_partitions(sys.argv[2])
     elif command == 'search':
         if len(sys.argv) < 3:
             print("Error: Search query required.")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test script for the partitioned ProposalDatabase storage
+Covers migration from proposals.json, dirty-partition tracking, incremental backups
+and search result caching
+"""
+
+import json
+import os
+import tempfile
+
+# Importing database builds the global instance from DATABASE_FILE; point it at a
+# path that does not exist so the real proposals.json is never loaded or migrated
+os.environ['DATABASE_FILE'] = os.path.join(tempfile.gettempdir(), 'proposer-test-unused', 'proposals.json')
+
+from database import ProposalDatabase
+
+LEGACY_PROPOSALS = [
+    {'id': 1, 'title': 'Old REIT', 'timestamp': '2024-01-15T10:00:00', 'investment': '1'},
+    {'id': 2, 'title': 'Undated idea', 'investment': '0.5'},
+    {'id': 3, 'title': 'Lightning tips', 'timestamp': '2024-03-02T09:30:00', 'investment': '0.1'}
+]
+
+def segment_files(database):
+    """Segment files (excluding the manifest) currently in the data directory."""
+    return sorted(f for f in os.listdir(database.data_dir) if f != ProposalDatabase.MANIFEST_NAME)
+
+def new_database(tmp_dir, proposals=LEGACY_PROPOSALS):
+    """Write a legacy proposals.json into tmp_dir and open it."""
+    db_file = os.path.join(tmp_dir, 'proposals.json')
+    with open(db_file, 'w', encoding='utf-8') as f:
+        json.dump(proposals, f)
+    return ProposalDatabase(db_file)
+
+def test_migration():
+    """Legacy proposals.json is split into monthly segments and reloads in order"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database = new_database(tmp_dir)
+
+        assert segment_files(database) == ['2024-01.json', '2024-03.json', 'undated.json'], "Segments not created"
+        assert os.path.exists(database.db_file), "Legacy file should be left in place"
+        assert {p: i['count'] for p, i in database.manifest.items()} == {'2024-01': 1, '2024-03': 1, 'undated': 1}
+
+        database.add_proposal({'title': 'Fresh'})
+        reloaded = ProposalDatabase(database.db_file)
+        assert [p['id'] for p in reloaded.proposals] == [1, 2, 3, 4], "Order not preserved after reload"
+        print("✅ Migration: proposals.json split into segments, order preserved")
+
+def test_update_moves_partition():
+    """Changing a timestamp moves the proposal and rewrites both segments"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database = new_database(tmp_dir)
+        untouched = database.manifest['2024-03']['sha256']
+
+        database.update_proposal(1, {'timestamp': '2024-05-01T12:00:00'})
+
+        assert '2024-01' not in database.manifest, "Emptied partition still in manifest"
+        assert segment_files(database) == ['2024-03.json', '2024-05.json', 'undated.json'], "Segments not moved"
+        assert database.manifest['2024-03']['sha256'] == untouched, "Untouched partition was rewritten"
+
+        reloaded = ProposalDatabase(database.db_file)
+        assert reloaded.get_proposal_by_id(1)['timestamp'] == '2024-05-01T12:00:00'
+        assert reloaded.get_statistics()['partitions'] == {'2024-03': 1, '2024-05': 1, 'undated': 1}
+        print("✅ Update: proposal moved between month partitions")
+
+def test_delete_last_in_partition():
+    """Deleting the only proposal in a month removes its segment"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database = new_database(tmp_dir)
+
+        assert database.delete_proposal(3), "Delete failed"
+        assert '2024-03' not in database.manifest, "Empty partition still in manifest"
+        assert segment_files(database) == ['2024-01.json', 'undated.json'], "Empty segment not removed"
+        assert len(ProposalDatabase(database.db_file).proposals) == 2
+        print("✅ Delete: empty partition removed from disk and manifest")
+
+def test_backup_skips_unchanged():
+    """Incremental backups copy only partitions whose checksum changed"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database = new_database(tmp_dir)
+        backup_dir = os.path.join(tmp_dir, 'backup')
+
+        assert database.backup_partitions(backup_dir) == ['2024-01', '2024-03', 'undated']
+        assert database.backup_partitions(backup_dir) == [], "Unchanged partitions copied again"
+
+        database.update_proposal(3, {'title': 'Lightning tips v2'})
+        assert database.backup_partitions(backup_dir) == ['2024-03'], "Only the changed partition should be copied"
+
+        database.delete_proposal(1)
+        assert database.backup_partitions(backup_dir) == []
+        assert not os.path.exists(os.path.join(backup_dir, '2024-01.json')), "Deleted partition left in backup"
+        print("✅ Backup: unchanged partitions skipped, removed partitions pruned")
+
+def test_corrupt_partition_is_preserved():
+    """One unreadable segment does not wipe or orphan the other partitions"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database = new_database(tmp_dir)
+        corrupt_path = os.path.join(database.data_dir, '2024-01.json')
+        with open(corrupt_path, 'w', encoding='utf-8') as f:
+            f.write('{not json')
+
+        reloaded = ProposalDatabase(database.db_file)
+        assert reloaded.unreadable_partitions == {'2024-01'}, "Corrupt partition not reported"
+        assert [p['id'] for p in reloaded.proposals] == [2, 3], "Readable partitions not loaded"
+
+        added = reloaded.add_proposal({'title': 'After corruption'})
+        assert added['id'] == 4, "New proposal reused an id from the unreadable partition"
+        assert set(reloaded.manifest) == {'2024-01', '2024-03', 'undated', added['timestamp'][:7]}, \
+            "Manifest dropped partitions"
+        with open(corrupt_path, 'r', encoding='utf-8') as f:
+            assert f.read() == '{not json', "Unreadable segment was overwritten"
+
+        # Repairing the segment brings every proposal back
+        with open(corrupt_path, 'w', encoding='utf-8') as f:
+            json.dump([LEGACY_PROPOSALS[0]], f)
+        assert [p['id'] for p in ProposalDatabase(database.db_file).proposals] == [1, 2, 3, 4]
+        print("✅ Corruption: unreadable partition kept intact, others still writable")
+
+def test_search_cache():
+    """Repeated searches hit the cache and any write invalidates it"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database = new_database(tmp_dir)
+        cache = database.search_cache
+
+        assert [p['id'] for p in database.search_proposals('lightning')] == [3]
+        assert (cache.hits, cache.misses) == (0, 1)
+        assert [p['id'] for p in database.search_proposals('LIGHTNING')] == [3], "Normalized query missed"
+        assert (cache.hits, cache.misses) == (1, 1), "Repeated query was not a cache hit"
+
+        database.add_proposal({'title': 'Lightning routing'})
+        assert [p['id'] for p in database.search_proposals('lightning')] == [3, 4], "Stale results after add"
+        assert cache.misses == 2, "Write did not invalidate the cache"
+
+        database.delete_proposal(3)
+        assert [p['id'] for p in database.search_proposals('lightning')] == [4], "Stale results after delete"
+        assert database.get_statistics()['search_cache']['hits'] == 1
+        print("✅ Search cache: repeated queries hit, writes invalidate")
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Partitioned Proposal Database\n")
+
+    tests = [
+        test_migration,
+        test_update_moves_partition,
+        test_delete_last_in_partition,
+        test_backup_skips_unchanged,
+        test_corrupt_partition_is_preserved,
+        test_search_cache
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n📊 Results: {passed}/{total} tests passed")
+
+    if passed != total:
+        print("❌ Some tests failed - check the errors above")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for the load_test.py report helpers
+Checks the nearest-rank percentiles used for sizing deployments
+"""
+
+from load_test import parse_mix, percentile
+
+def test_percentile():
+    """Nearest-rank percentiles round the rank up"""
+    values = [1, 2, 3, 4, 5]
+    assert percentile(values, 50) == 3, "Median of 5 values should be the 3rd"
+    assert percentile(values, 100) == 5
+    assert percentile(values, 1) == 1
+
+    latencies = list(range(1, 101))
+    assert percentile(latencies, 50) == 50
+    assert percentile(latencies, 95) == 95
+    assert percentile(latencies, 99) == 99
+    assert percentile(list(range(1, 21)), 95) == 19
+    assert percentile(list(range(1, 11)), 95) == 10, "p95 of 10 values should be the max"
+    assert percentile([], 99) == 0.0
+    print("✅ percentile: nearest-rank values")
+
+def test_parse_mix():
+    """Mix strings become endpoint weights"""
+    assert parse_mix('search=5,health') == {'search': 5.0, 'health': 1.0}
+    try:
+        parse_mix('search=1,bogus=2')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown endpoint accepted")
+    print("✅ parse_mix: weights parsed, unknown endpoints rejected")
+
+def main():
+    """Run all tests"""
+    print("🧪 Testing Load Test Helpers\n")
+
+    tests = [
+        test_percentile,
+        test_parse_mix
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n📊 Results: {passed}/{total} tests passed")
+
+    if passed != total:
+        print("❌ Some tests failed - check the errors above")
+
+if __name__ == "__main__":
+    main()